@@ -1,17 +1,18 @@
 import logging
-import traceback
 import asyncio
 
 from airflow import DAG
 from airflow.operators.python import PythonOperator
+from airflow.utils.trigger_rule import TriggerRule
 
 from cache.city_cache import CityCache
-from scraper.scraper import TripAdvisorScraper
-from gcp_client import GCP_Client
+from scraper.scraper import TripAdvisorScraper, close_session
+from gcp_client import get_gcp_client
 from openai_embedding import get_text_embeddings
 from utils import kill_airflow_job
 
 from pinecone_db import (
+    create_backup_data,
     create_pinecone_data,
     pinecone_upsert_data
 )
@@ -19,52 +20,95 @@ from config import (
     AIRFLOW_CITIES_PER_JOB,
     AIRFLOW_DAG_ID,
     AIRFLOW_SCHEDULE,
+    AIRFLOW_SCRAPER_POOL,
     AIRFLOW_START_DATE
 )
 logging.basicConfig(level=logging.INFO)
 
 
-def process_cities():
-    """ Airflow DAG function to process cities """
-    
+def collect_cities():
+    """ Airflow task function: pulls the next batch of unprocessed
+        cities from the cache, marking them processed, and fans them
+        out to the mapped process_city tasks via XCom. Kills the job
+        once every city in the cache has been processed.
+    Returns:
+        List[Dict[str, Any]]: The op_kwargs of the mapped tasks, one
+            entry per city.
+    """
     cache = CityCache(AIRFLOW_CITIES_PER_JOB)
     if cache.cache_complete():
         kill_airflow_job(AIRFLOW_DAG_ID)
-        return
-    
-    client = GCP_Client()
-     
-    for city_info in cache:
-
-        try:
-            logging.info(
-                f"PROCESSING: {city_info['city']} ({city_info['country']})"
-            )
-            scraper = TripAdvisorScraper(city_info)
-            loop = asyncio.get_event_loop()
-            attr_details = loop.run_until_complete(scraper.get_attr_details())
+        return []
+    return [{"city_info": city_info} for city_info in cache]
 
-            logging.info(
-                f"SCRAPED {len(attr_details)} / {scraper.max_attr} ATTRACTIONS"
-            )
-            embeddings = get_text_embeddings(attr_details)
-            pinecone_data = create_pinecone_data(attr_details, embeddings)
 
-            logging.info(f"GENERATED EMBEDDING DATA")
+def process_city(city_info):
+    """ Airflow task function: processes a single mapped city.
+        Failures propagate, so a broken city shows up as a failed
+        mapped task instance that Airflow can retry in isolation.
+    Args:
+        city_info (Dict[str, Any]): Dictionary of city information.
+    Returns:
+        str: The namespace of the successfully processed city.
+    """
+    return asyncio.run(process_city_pipeline(city_info))
+
 
-            filename = f"backups/{city_info['namespace']}.json"
-            client.upload_file(pinecone_data, filename)
+async def process_city_pipeline(city_info):
+    """ Scrapes, embeds and stores the attractions of a single city.
+        Blocking steps run via asyncio.to_thread so they don't stall
+        the event loop.
+    Args:
+        city_info (Dict[str, Any]): Dictionary of city information.
+    Returns:
+        str: The namespace of the successfully processed city.
+    """
+    client = get_gcp_client()
+    try:
+        logging.info(
+            f"PROCESSING: {city_info['city']} ({city_info['country']})"
+        )
+        scraper = await TripAdvisorScraper.create(city_info)
+        attr_details = await scraper.get_attr_details()
 
-            logging.info(f"UPLOADED BACKUP TO GCP")
+        logging.info(
+            f"SCRAPED {len(attr_details)} / {scraper.max_attr} ATTRACTIONS"
+        )
+        embeddings = await get_text_embeddings(attr_details)
+        pinecone_data = create_pinecone_data(attr_details, embeddings)
+
+        logging.info(f"GENERATED EMBEDDING DATA")
+
+        backup_data = create_backup_data(pinecone_data)
+        filename = f"backups/{city_info['namespace']}.json"
+        await asyncio.gather(
+            asyncio.to_thread(client.upload_file, backup_data, filename),
+            asyncio.to_thread(
+                pinecone_upsert_data, pinecone_data, city_info["namespace"]
+            )
+        )
 
-            pinecone_upsert_data(pinecone_data, city_info["namespace"])
+        logging.info(f"UPLOADED BACKUP TO GCP AND EMBEDDINGS TO PINECONE\n")
 
-            logging.info(f"UPLOADED EMBEDDINGS TO PINECONE\n")
+        return city_info["namespace"]
 
-        except Exception as err:
-            with open(f"error_log/{city_info['namespace']}.txt", "w") as file:
-                file.write(traceback.format_exc())
-                file.write(repr(err))
+    finally:
+        await close_session()
+
+
+def mark_results(namespaces):
+    """ Airflow task function: marks the cities processed by the
+        successful mapped tasks as successes in the cache. Runs with
+        trigger_rule ALL_DONE so it is the single cache writer at the
+        end of every run, whether or not all cities succeeded.
+    Args:
+        namespaces (List[str]): The namespaces returned by the
+            successful process_city tasks.
+    """
+    cache = CityCache(AIRFLOW_CITIES_PER_JOB)
+    for namespace in namespaces:
+        cache.mark_success({"namespace": namespace})
+    cache.flush()
 
 
 with DAG(dag_id=AIRFLOW_DAG_ID,
@@ -72,9 +116,20 @@ with DAG(dag_id=AIRFLOW_DAG_ID,
          start_date=AIRFLOW_START_DATE,
          default_args={'depends_on_past': False},
          schedule=AIRFLOW_SCHEDULE) as dag:
-    
-    task1 = PythonOperator(
-        python_callable=process_cities,
-        task_id="task1"
+
+    collect_cities_task = PythonOperator(
+        python_callable=collect_cities,
+        task_id="collect_cities"
+    )
+    process_city_task = PythonOperator.partial(
+        python_callable=process_city,
+        task_id="process_city",
+        pool=AIRFLOW_SCRAPER_POOL
+    ).expand(op_kwargs=collect_cities_task.output)
+    mark_results_task = PythonOperator(
+        python_callable=mark_results,
+        op_kwargs={"namespaces": process_city_task.output},
+        task_id="mark_results",
+        trigger_rule=TriggerRule.ALL_DONE
     )
-    task1
+    collect_cities_task >> process_city_task >> mark_results_task
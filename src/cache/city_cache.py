@@ -1,6 +1,8 @@
 import os
 import sys
-import json
+import atexit
+import orjson
+import tempfile
 
 from pathlib import Path
 
@@ -14,45 +16,72 @@ class CityCache:
     """ A class for iterating over a cache of city information.
 
     Attributes:
-        cache (List[Dict[str, Any]]): A list of dictionaries containing 
-            city information. Each dictionary should have "name", "type", 
+        cache (List[Dict[str, Any]]): A list of dictionaries containing
+            city information. Each dictionary should have "name", "type",
             and "processed" keys.
-        num_processed (int): The number of cities that have been 
+        num_processed (int): The number of cities that have been
             processed so far.
+        num_unprocessed (int): The number of cities in the cache that
+            have not yet been processed.
     """
 
     def __init__(self, cities_per_job):
-        """ Initializes a new instance of the CityCache class. 
+        """ Initializes a new instance of the CityCache class.
         Args:
-            cities_per_job (int): The number of cities to process 
+            cities_per_job (int): The number of cities to process
                 per airflow job
         """
         self.cities_per_job = cities_per_job
-        with open(CACHE_FILEPATH, "r") as file:
-            self.cache = json.load(file)
+        with open(CACHE_FILEPATH, "rb") as file:
+            self.cache = orjson.loads(file.read())
         self.num_processed = 0
-    
+        self.num_unprocessed = sum(
+            1 for info in self.cache if not info["processed"]
+        )
+        self._dirty = False
+        atexit.register(self.flush)
+
 
     def __iter__(self):
-        """ Iterates over a set number of cities in the cache that 
-            have not been processed. Update 'processed' field once 
-            city attractions have been scraped. Mark as 'success' if 
-            no errors raised and stored in pinecone
+        """ Iterates over a set number of cities in the cache that
+            have not been processed. Update 'processed' field once
+            a city has been handed out. Cities are marked as 'success'
+            separately via mark_success once stored in pinecone, so
+            callers can process the yielded cities concurrently.
+            Updates are buffered in memory and flushed to disk once
+            when the iterator is exhausted.
         Yields:
-            Tuple[str, str]: A tuple containing the name and type of a city.
+            Dict[str, Any]: A dictionary of city information.
+        """
+        try:
+            for idx, city_info in enumerate(self.cache):
+                processed = city_info["processed"]
+                if not processed:
+                    self.cache[idx]["processed"] = True
+                    self.cache[idx]["success"] = False
+                    self.num_unprocessed -= 1
+                    self._dirty = True
+                    yield city_info
+                    self.num_processed += 1
+                    if self.num_processed == self.cities_per_job :
+                        return
+        finally:
+            self.flush()
+
+
+    def mark_success(self, city_info) -> None:
+        """ Marks a city as successfully processed and stored in pinecone.
+            The update is buffered in memory; callers should flush()
+            once they have marked every city.
+        Args:
+            city_info (Dict[str, Any]): The city information dictionary
+                previously yielded by the iterator.
         """
-        for idx, city_info in enumerate(self.cache):
-            processed = city_info["processed"]
-            if not processed:
-                self.cache[idx]["processed"] = True
-                self.cache[idx]["success"] = False
-                self.update_cache()
-                yield city_info
+        for idx, info in enumerate(self.cache):
+            if info["namespace"] == city_info["namespace"]:
                 self.cache[idx]["success"] = True
-                self.update_cache()
-                self.num_processed += 1
-                if self.num_processed == self.cities_per_job :
-                    return
+                self._dirty = True
+                return
 
 
     def cache_complete(self) -> bool:
@@ -60,14 +89,19 @@ class CityCache:
         Returns:
             bool: True if all cities have been processed, False otherwise.
         """
-        for info in self.cache:
-            if not info["processed"]:
-                return False
-        return True
+        return self.num_unprocessed == 0
 
 
-    def update_cache(self) -> None:
-        """ Writes the current state of the cache to a file. """
-        with open(CACHE_FILENAME, "w") as file:
-            json.dump(self.cache, file, indent=4)
-            
+    def flush(self) -> None:
+        """ Writes the current state of the cache to a tempfile and
+            atomically replaces the cache file, if there are any
+            unflushed updates. Also registered atexit as crash cover,
+            but callers that buffer updates should flush explicitly.
+        """
+        if not self._dirty:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILEPATH))
+        with os.fdopen(fd, "wb") as file:
+            file.write(orjson.dumps(self.cache, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, CACHE_FILEPATH)
+        self._dirty = False
@@ -12,17 +12,20 @@ PINECONE_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_ENV = os.getenv("PINECONE_ENV")
 PINECONE_INDEX = os.getenv("PINECONE_INDEX")
 PINECONE_UPSERT_BATCH = 100
+PINECONE_UPSERT_THREADS = 30
 
 # OpenAI API key / model info
 OPENAI_KEY = os.getenv('OPENAI_API_KEY')
 OPENAI_MODEL = "text-embedding-ada-002"
 OPENAI_EMBEDDING_BATCH = 100
+OPENAI_EMBEDDING_CONCURRENCY = 8
 
 # Aiflow job parameters
 AIRFLOW_DAG_ID = "trip-advisor-web-scraper"
 AIRFLOW_START_DATE = datetime(2023, 5, 8, 8, 0, )
 AIRFLOW_SCHEDULE = "*/5 * * * *"
 AIRFLOW_CITIES_PER_JOB = 2
+AIRFLOW_SCRAPER_POOL = "scraper_pool"  # airflow pools set scraper_pool <slots> ""
 
 # TripAdvisor event processing parameters
 TRIPADVISOR_API_URL = "https://www.tripadvisor.com/data/graphql/ids"
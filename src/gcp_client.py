@@ -1,5 +1,8 @@
-import json
+import gzip
+import orjson
+import tempfile
 
+from functools import lru_cache
 from google.cloud import storage
 from google.oauth2.service_account import Credentials
 from google.api_core.exceptions import TooManyRequests
@@ -8,6 +11,8 @@ from typing import Dict, Any
 
 from config import GS_BUCKET, GS_PROJECT_ID, GS_SERVICE_KEY
 
+UPLOAD_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
 
 class RetryOnGcpTimeoutError(BaseTimeoutDecoratorClass):
     """ A decorator for retrying a function when a GCP 
@@ -30,9 +35,21 @@ class GCP_Client:
 
 
     def __init__(self) -> None:
-        """ Initializes a new instance of the GCP_Client class. """
+        """ Initializes a new instance of the GCP_Client class. The
+            bucket handle is built locally without the existence-check
+            RPC that get_bucket performs; call precheck to validate
+            the bucket explicitly.
+        """
         creds = Credentials.from_service_account_file(GS_SERVICE_KEY)
         self.client = storage.Client(project=GS_PROJECT_ID, credentials=creds)
+        self.bucket = self.client.bucket(GS_BUCKET)
+
+
+    @RetryOnGcpTimeoutError(retries=20, wait=0.2)
+    def precheck(self) -> None:
+        """ Validates that the GCP bucket exists, raising if it does
+            not. Performs the get_bucket RPC that __init__ skips.
+        """
         self.bucket = self.client.get_bucket(GS_BUCKET)
 
 
@@ -58,25 +75,63 @@ class GCP_Client:
         """
         blob = self.bucket.blob(json_file)
         file_str = blob.download_as_string()
-        return json.loads(file_str)
+        return orjson.loads(file_str)
 
 
     @RetryOnGcpTimeoutError(retries=100, wait=0.2)
     def upload_file(
         self, data: Dict[str, Any], file_name: str, overwrite: bool = True) -> None:
-        """ Uploads a JSON file to the GCP bucket.
+        """ Uploads a JSON file to the GCP bucket. The payload is
+            gzip-compressed into a spooled tempfile and uploaded from
+            there, so large payloads are never held in memory as a
+            single serialized string.
         Args:
-            data (Dict[str, Any]): A dictionary containing the 
+            data (Dict[str, Any]): A dictionary containing the
                     data to be uploaded.
             file_name (str): The name of the file to upload.
-            overwrite (bool, optional): If True, overwrite the file 
-                    if it already exists. If False and the file already 
+            overwrite (bool, optional): If True, overwrite the file
+                    if it already exists. If False and the file already
                     exists, raise an AssertionError. Defaults to True.
         """
         if not overwrite:
             assert not self.check_file_exists(file_name)
-        data = json.dumps(data)
-        blob = self.bucket.blob(file_name)
-        blob.upload_from_string(
-            data, content_type="application/json"
-        )
+        with tempfile.SpooledTemporaryFile(
+                max_size=UPLOAD_SPOOL_MAX_SIZE) as file:
+            with gzip.GzipFile(fileobj=file, mode="wb") as gz_file:
+                self._write_json_stream(gz_file, data)
+            file.seek(0)
+            blob = self.bucket.blob(file_name)
+            blob.content_encoding = "gzip"
+            blob.upload_from_file(file, content_type="application/json")
+
+
+    @staticmethod
+    def _write_json_stream(file: Any, data: Dict[str, Any]) -> None:
+        """ Serializes data to JSON into a file object. Lists are
+            framed element by element so only one element is ever
+            serialized in memory at a time.
+        Args:
+            file (Any): A writable binary file object.
+            data (Dict[str, Any]): The data to serialize.
+        """
+        if isinstance(data, list):
+            file.write(b"[")
+            for idx, item in enumerate(data):
+                if idx:
+                    file.write(b",")
+                file.write(orjson.dumps(item))
+            file.write(b"]")
+        else:
+            file.write(orjson.dumps(data))
+
+
+@lru_cache(maxsize=1)
+def get_gcp_client() -> GCP_Client:
+    """ Returns the process-wide GCP_Client instance, creating it on
+        first use. Memoizing the client avoids re-reading and parsing
+        the service key file for every caller and lets all callers
+        share one authenticated connection pool.
+    Returns:
+        GCP_Client: The shared GCP client.
+    """
+    return GCP_Client()
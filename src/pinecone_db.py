@@ -1,25 +1,39 @@
+import base64
 import uuid
 import pinecone
 
+import numpy as np
+
 from typing import List, Dict, Any
 from utils import batch_data
 
 from config import (
-    PINECONE_ENV, PINECONE_INDEX, PINECONE_KEY, PINECONE_UPSERT_BATCH
+    PINECONE_ENV, PINECONE_INDEX, PINECONE_KEY,
+    PINECONE_UPSERT_BATCH, PINECONE_UPSERT_THREADS
 )
 
 def pinecone_upsert_data(
         pinecone_data: List[Dict[str, Any]], namespace: str) -> None:
-    """ Upserts data to a Pinecone index in batches.
+    """ Upserts data to a Pinecone index in parallel batches. Each
+        batch is submitted with async_req=True so network round trips
+        overlap across the index's thread pool; results are collected
+        afterwards to surface any errors.
     Args:
-        pinecone_data (List[Dict[str, Any]]): The data to be upserted, 
+        pinecone_data (List[Dict[str, Any]]): The data to be upserted,
             where each element is a dictionary representing a vector.
         namespace (str): The namespace of the Pinecone index.
     """
     pinecone.init(api_key=PINECONE_KEY, environment=PINECONE_ENV)
-    pinecone_index = pinecone.Index(PINECONE_INDEX)
-    for pinecone_batch in batch_data(pinecone_data, PINECONE_UPSERT_BATCH):
-        pinecone_index.upsert(pinecone_batch, namespace=namespace)
+    with pinecone.Index(
+            PINECONE_INDEX, pool_threads=PINECONE_UPSERT_THREADS) as index:
+        results = [
+            index.upsert(pinecone_batch, namespace=namespace, async_req=True)
+            for pinecone_batch in batch_data(
+                pinecone_data, PINECONE_UPSERT_BATCH
+            )
+        ]
+        for result in results:
+            result.get()
     
 
 def create_pinecone_data(
@@ -44,4 +58,40 @@ def create_pinecone_data(
             "metadata": metadata,
             "values": embedding_list[idx]["embedding"]
         })
-    return pinecone_data
\ No newline at end of file
+    return pinecone_data
+
+
+def create_backup_data(
+        pinecone_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """ Creates a compact copy of pinecone data for the GCS backup.
+        Embedding values are quantized to float16 and base64-encoded,
+        halving the bytes uploaded and stored; the pinecone upsert
+        itself still receives the full precision values.
+    Args:
+        pinecone_data (List[Dict[str, Any]]): The pinecone data
+            created by create_pinecone_data.
+    Returns:
+        backup_data (List[Dict[str, Any]]): The pinecone data with
+            each "values" list replaced by a base64 float16 string.
+    """
+    backup_data = []
+    for item in pinecone_data:
+        values = np.asarray(item["values"], dtype=np.float16)
+        backup_data.append({
+            "id": item["id"],
+            "metadata": item["metadata"],
+            "values": base64.b64encode(values.tobytes()).decode("ascii")
+        })
+    return backup_data
+
+
+def decode_backup_values(encoded_values: str) -> List[float]:
+    """ Decodes the base64 float16 values of a backup entry back to
+        a float32 embedding list.
+    Args:
+        encoded_values (str): The base64 string stored in the backup.
+    Returns:
+        List[float]: The decoded embedding values.
+    """
+    values = np.frombuffer(base64.b64decode(encoded_values), dtype=np.float16)
+    return values.astype(np.float32).tolist()
\ No newline at end of file
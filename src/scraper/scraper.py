@@ -1,15 +1,14 @@
-import json
 import aiohttp
 import asyncio
 import base64
 import math
+import orjson
 import sys
-import requests
 import logging
 
 from typing import List, Dict, Optional, Tuple
 from tenacity import retry, stop_after_attempt, wait_fixed
-from functools import reduce
+from itertools import chain
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -29,26 +28,60 @@ from .utils.request import (
 )
 
 from .utils.response import (
+    index_sections,
     parse_attr_ids_response,
     parse_activity_duration,
     parse_business_description,
     parse_business_hours,
     parse_business_tags,
     parse_business_website,
-    compute_distance
+    POICoordinates
 )
 
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """ Returns the shared aiohttp session, creating it on first use.
+        The session pools connections across cities so TCP/TLS
+        handshakes to TripAdvisor are only paid once per connection.
+    Returns:
+        aiohttp.ClientSession: The shared pooled client session.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100, limit_per_host=20, enable_cleanup_closed=True
+        )
+        # Socket-level timeouts only: gathers queue one request per
+        # attraction behind limit_per_host, so pool wait must not
+        # count against the timeout the way total/connect would.
+        timeout = aiohttp.ClientTimeout(sock_connect=10, sock_read=30)
+        _session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return _session
+
+
+async def close_session() -> None:
+    """ Closes the shared aiohttp session if it is open. """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
 class TripAdvisorScraper:
-    """ A scraper for extracting information about attractions 
+    """ A scraper for extracting information about attractions
         in a city from TripAdvisor.
     """
 
     def __init__(self, city_info: Dict, max_attr: Optional[int] = None):
         """ Initialize a new instance of the TripAdvisorScraper class.
+            Use the async create factory to obtain a fully initialized
+            instance; __init__ does no network I/O itself.
         Args:
-            city_info (Dict): A dictionary containing information 
+            city_info (Dict): A dictionary containing information
                     about the city.
-            max_attr (Optional[int], optional): The maximum number of 
+            max_attr (Optional[int], optional): The maximum number of
                     attractions to fetch. Defaults to None.
         """
         self.city = city_info["city"]
@@ -58,17 +91,39 @@ class TripAdvisorScraper:
         self.lng = city_info["lng"]
 
         self.headers = load_headers_json()
-        self.city_id = self.get_city_id()
+        self._max_attr_limit = max_attr
 
-        self.max_attr = self.get_max_attr()
-        if max_attr is not None:
-            self.max_attr = min(self.max_attr, max_attr)
-
-        self.max_pages = math.ceil(self.max_attr / 30)
+        self.city_id = None
+        self.max_attr = None
+        self.max_pages = None
         self.attr_ids = None
 
 
-    def get_city_id(self) -> Optional[int]:
+    @classmethod
+    async def create(
+            cls, city_info: Dict,
+            max_attr: Optional[int] = None) -> "TripAdvisorScraper":
+        """ Asynchronously create and initialize a TripAdvisorScraper,
+            resolving the city ID and attraction count via the shared
+            pooled session.
+        Args:
+            city_info (Dict): A dictionary containing information
+                    about the city.
+            max_attr (Optional[int], optional): The maximum number of
+                    attractions to fetch. Defaults to None.
+        Returns:
+            TripAdvisorScraper: An initialized scraper instance.
+        """
+        scraper = cls(city_info, max_attr)
+        scraper.city_id = await scraper.get_city_id()
+        scraper.max_attr = await scraper.get_max_attr()
+        if scraper._max_attr_limit is not None:
+            scraper.max_attr = min(scraper.max_attr, scraper._max_attr_limit)
+        scraper.max_pages = math.ceil(scraper.max_attr / 30)
+        return scraper
+
+
+    async def get_city_id(self) -> Optional[int]:
         """
         Get the TripAdvisor ID for the city.
 
@@ -77,24 +132,29 @@ class TripAdvisorScraper:
         """
         city_request = ', '.join([self.city, self.country])
         request = load_city_id_request_json(city_request)
-        response = self.get_sync_request(request)
+        response = await self.get_async_request(request)
+        candidates = []
         for item in response[0]['data']['Typeahead_autocomplete']['results']:
             if item["__typename"] == "Typeahead_LocationItem":
                 try:
-                    item_lat = item["details"]["latitude"]
-                    item_lng = item["details"]["longitude"]
-                    dist = compute_distance(
-                        self.lat, self.lng, item_lat, item_lng
-                    )
-                    if dist < MIN_DISTANCE:
-                        return item["locationId"]
+                    candidates.append({
+                        "id": item["locationId"],
+                        "lat": item["details"]["latitude"],
+                        "lng": item["details"]["longitude"]
+                    })
                 except KeyError:
                     continue
+        if candidates:
+            pois = POICoordinates.from_dicts(candidates)
+            distances = pois.distances_from(self.lat, self.lng)
+            for dist, location_id in zip(distances, pois.ids):
+                if dist < MIN_DISTANCE:
+                    return location_id
         msg = f"No city_id found for {self.city}"
         logging.log(logging.WARNING, msg)
 
 
-    def get_max_attr(self) -> int:
+    async def get_max_attr(self) -> int:
         """ Get the maximum number of attractions to fetch.
         Returns:
             int: The maximum number of attractions to fetch.
@@ -102,7 +162,7 @@ class TripAdvisorScraper:
         if self.city_id is None:
             return
         request = load_attr_id_request_json(self.city_id, 0)
-        response = self.get_sync_request(request)
+        response = await self.get_async_request(request)
         for item in response[0]['data']['Result'][0]['sections'][::-1]:
             if item["__typename"] == 'WebPresentation_PaginationLinksList':
                 return item.get("totalResults", 30)
@@ -116,11 +176,10 @@ class TripAdvisorScraper:
         """
         tasks = []
         await self.get_attr_ids()
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            for attr_id in self.attr_ids[:self.max_attr]:
-                request = load_attr_detail_request_json(attr_id["id"])
-                tasks.append(self.get_async_request(session, request))
-            data = await asyncio.gather(*tasks)
+        for attr_id in self.attr_ids[:self.max_attr]:
+            request = load_attr_detail_request_json(attr_id["id"])
+            tasks.append(self.get_async_request(request))
+        data = await asyncio.gather(*tasks)
         data = self.format_attr_details(data)
         return data
     
@@ -131,14 +190,13 @@ class TripAdvisorScraper:
         """
         if self.attr_ids is None:
             tasks = []
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                for page in range(self.max_pages):
-                    request = load_attr_id_request_json(self.city_id, page)
-                    tasks.append(self.get_async_request(session, request))
-                data = await asyncio.gather(*tasks)
-            self.attr_ids = reduce(lambda x, y: x + y, [
+            for page in range(self.max_pages):
+                request = load_attr_id_request_json(self.city_id, page)
+                tasks.append(self.get_async_request(request))
+            data = await asyncio.gather(*tasks)
+            self.attr_ids = list(chain.from_iterable(
                 parse_attr_ids_response(item) for item in data
-            ])
+            ))
     
 
     def format_attr_details(self, data: List[Dict]) -> List[Dict]:
@@ -149,6 +207,7 @@ class TripAdvisorScraper:
             List[Dict]: The formatted attraction details.
         """
         details = []
+        skipped = 0
         for idx, item in enumerate(data):
             try:
                 details.append({
@@ -156,25 +215,29 @@ class TripAdvisorScraper:
                     "name": self.attr_ids[idx]["name"],
                     **self.parse_attr_details_response(item)
                 })
-            except:
-                continue
-        return details        
+            except (KeyError, IndexError, TypeError,
+                    ValueError, AttributeError):
+                skipped += 1
+        if skipped:
+            logging.warning(
+                f"SKIPPED {skipped} / {len(data)} ATTRACTION RESPONSES"
+            )
+        return details
     
 
-    def extract_lat_lng(self, data: List[Dict]) -> Tuple[float, float]:
+    def extract_lat_lng(self, groups: List[Dict]) -> Tuple[float, float]:
         """ Extract latitude and longitude from the given data.
         Args:
-            data (List[Dict]): The data containing latitude and 
-                    longitude information.
+            groups (List[Dict]): The detail section groups of the
+                    response, resolved by index_sections.
         Returns:
             Tuple[float, float]: The latitude and longitude.
         """
-        try:
-            info = data[0]["data"]["Result"][0]["detailSectionGroups"]\
-                       [3]["staticMap"]["center"]
-            return info["latitude"], info["longitude"]
-        except:
-            return self.lat, self.lng
+        if len(groups) > 3:
+            center = (groups[3].get("staticMap") or {}).get("center") or {}
+            if "latitude" in center and "longitude" in center:
+                return center["latitude"], center["longitude"]
+        return self.lat, self.lng
         
 
     def parse_attr_details_response(self, data: Dict) -> Dict:
@@ -184,8 +247,9 @@ class TripAdvisorScraper:
         Returns:
             Dict: The parsed attraction details.
         """
-        general = json.loads(data[0]["data"]["Result"][0]["container"]["jsonLd"])
-        latitude, longitude = self.extract_lat_lng(data)
+        root, groups, sections_by_type = index_sections(data)
+        general = orjson.loads(root["container"]["jsonLd"])
+        latitude, longitude = self.extract_lat_lng(groups)
         result = {
             "type": general.get("@type", ""),
             "address": general.get("address", {}).get("streetAddress", ""),
@@ -200,11 +264,11 @@ class TripAdvisorScraper:
             "image_url": general.get("image", ""),
             "latitude": latitude,
             "longitude": longitude,
-            "description": parse_business_description(data),
-            "activity_duration": parse_activity_duration(data),
-            "website": parse_business_website(data),
-            "tags": parse_business_tags(data),
-            "hours": parse_business_hours(data)
+            "description": parse_business_description(groups),
+            "activity_duration": parse_activity_duration(groups),
+            "website": parse_business_website(sections_by_type),
+            "tags": parse_business_tags(sections_by_type),
+            "hours": parse_business_hours(sections_by_type)
         }
         if result["rating"] is not None:
             result["rating"] = float(result["rating"])
@@ -216,31 +280,17 @@ class TripAdvisorScraper:
 
 
     @retry(stop=stop_after_attempt(5), wait=wait_fixed(2))
-    async def get_async_request(
-        self, session: aiohttp.ClientSession, request: Dict) -> Dict:
-        """ Asynchronously send an HTTP request.
+    async def get_async_request(self, request: Dict) -> Dict:
+        """ Asynchronously send an HTTP request via the shared
+            pooled session.
         Args:
-            session (aiohttp.ClientSession): The aiohttp ClientSession 
-                    to use for the request. request (Dict): The request data.
+            request (Dict): The request data.
         Returns:
             Dict: The JSON response from the request.
         """
+        session = await get_session()
         async_session = session.post(
             TRIPADVISOR_API_URL, headers=self.headers, json=request
         )
         async with async_session as response:
-            return await response.json()
-
-
-    @retry(stop=stop_after_attempt(5), wait=wait_fixed(2))
-    def get_sync_request(self, request: Dict) -> Dict:
-        """ Synchronously send an HTTP request.
-        Args:
-            request (Dict): The request data.
-        Returns:
-            Dict: The JSON response from the request.
-        """
-        response = requests.post(
-            TRIPADVISOR_API_URL, headers=self.headers, json=request
-        )
-        return response.json()
\ No newline at end of file
+            return orjson.loads(await response.read())
\ No newline at end of file
@@ -1,7 +1,8 @@
 import os
-import json
+import orjson
 import sys
 
+from copy import deepcopy
 from typing import List, Dict
 from pathlib import Path
 
@@ -21,6 +22,31 @@ REQUEST_CITY_ID_FILEPATH = os.path.join(BASE_FILEPATH, REQUEST_CITY_ID_JSON)
 REQUEST_HEADER_FILEPATH = os.path.join(BASE_FILEPATH, REQUEST_HEADER_JSON)
 
 
+def _load_template(filepath: str) -> Dict:
+    """ Loads a JSON request template from a file.
+    Args:
+        filepath (str): The path of the template file to load.
+    Returns:
+        Dict: The parsed template.
+    """
+    with open(filepath, "rb") as file:
+        return orjson.loads(file.read())
+
+
+# Templates are parsed once at import time; loaders hand out deep
+# copies so callers can mutate them freely.
+_ATTR_ID_TEMPLATE = _load_template(REQUEST_ATTR_ID_FILEPATH)
+_ATTR_DETAILS_TEMPLATE = _load_template(REQUEST_ATTR_DETAILS_FILEPATH)
+_CITY_ID_TEMPLATE = _load_template(REQUEST_CITY_ID_FILEPATH)
+_HEADERS_TEMPLATE = _load_template(REQUEST_HEADER_FILEPATH)
+
+# Ask for compressed bodies on keep-alive connections; aiohttp
+# decompresses automatically. Brotli is left out of the accepted
+# encodings since the brotli codec isn't an installed dependency.
+_HEADERS_TEMPLATE.setdefault("accept-encoding", "gzip, deflate")
+_HEADERS_TEMPLATE.setdefault("connection", "keep-alive")
+
+
 def load_attr_id_request_json(
         city_id: str, page: int, num_attr: int=30) -> List[Dict]:
     """ Load the JSON request template for requesting a list 
@@ -34,8 +60,7 @@ def load_attr_id_request_json(
     Returns:
         List[Dict]: A list of dictionaries representing the JSON request.
     """
-    with open(REQUEST_ATTR_ID_FILEPATH, "r") as file:
-        request = json.load(file)
+    request = deepcopy(_ATTR_ID_TEMPLATE)
     pagee = str(page * num_attr)
     request[0]["variables"]["request"]["routeParameters"]["geoId"] = city_id
     request[0]["variables"]["request"]["routeParameters"]["pagee"] = pagee
@@ -52,8 +77,7 @@ def load_attr_detail_request_json(attr_id: str) -> List[Dict]:
     Returns:
         List[Dict]: A list of dictionaries representing the JSON request.
     """
-    with open(REQUEST_ATTR_DETAILS_FILEPATH, "r") as file:
-        request = json.load(file)
+    request = deepcopy(_ATTR_DETAILS_TEMPLATE)
     request[0]["variables"]["request"]["routeParameters"]["contentId"] = attr_id
     return request
 
@@ -67,8 +91,7 @@ def load_city_id_request_json(city: str) -> List[Dict]:
     Returns:
         List[Dict]: A list of dictionaries representing the JSON request.
     """
-    with open(REQUEST_CITY_ID_FILEPATH, "r") as file:
-        request = json.load(file)
+    request = deepcopy(_CITY_ID_TEMPLATE)
     request[0]["variables"]["request"]["query"] = city
     return request
 
@@ -78,6 +101,4 @@ def load_headers_json() -> Dict:
     Returns:
         Dict: A dictionary containing the necessary headers.
     """
-    with open(REQUEST_HEADER_FILEPATH, "r") as file:
-        headers = json.load(file)
-    return headers
\ No newline at end of file
+    return deepcopy(_HEADERS_TEMPLATE)
\ No newline at end of file
@@ -1,182 +1,443 @@
 import re
-import json
 import sys
+import math
 import base64
+import orjson
 
 import numpy as np
 
-from typing import List, Dict, Any
-from geopy import distance
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from contextlib import suppress
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 
 from config import DEFAULT_DURATION
 
+try:
+    import pybase64
+    _b64decode = pybase64.b64decode
+except ImportError:
+    _b64decode = base64.b64decode
+
+EARTH_RADIUS_KM = 6371.0088
+
+_DIGIT_RE = re.compile(r'\d+')
+
+# Splits tag strings on the bullet separator and swallows the
+# surrounding whitespace in the same pass, so no per-tag strip
+# is needed afterwards.
+_TAG_SPLIT = re.compile(r'\s*•\s*')
+
+# Below this input length the SIMD decoder's dispatch overhead costs
+# more than it saves, so short strings stay on stdlib base64.
+_B64_SIMD_MIN_LEN = 256
+
+# __typename constants interned once so equality checks against
+# sections can take the pointer-identity fast path instead of a
+# full 40-character compare on every item.
+_TYPE_FLEX_CARD = sys.intern("WebPresentation_SingleFlexCardSection")
+_TYPE_ABOUT_CONTENT = sys.intern("WebPresentation_AboutContentWeb")
+_TYPE_ABOUT_GROUP = sys.intern("WebPresentation_AttractionAboutSectionGroup")
+_TYPE_POI_OVERVIEW = sys.intern("WebPresentation_PoiOverviewWeb")
+_TYPE_POI_HOURS = sys.intern("WebPresentation_PoiHoursWeb")
+_TYPE_CONTACT_LINK = sys.intern("WebPresentation_ContactLink")
+
 
 def compute_distance(
         lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """ Computes the distance in kilometers between two sets of coordinates.
+    """ Computes the distance in kilometers between two sets of
+        coordinates. Thin scalar wrapper around the vectorized
+        haversine kernel in compute_distances.
     Returns:
         float: The distance in kilometers between the two sets of coordinates.
     """
-    coords_1 = (lat1, lng1)
-    coords_2 = (lat2, lng2)
-    return distance.geodesic(coords_1, coords_2).km
+    distances = compute_distances(
+        lat1, lng1, np.array([lat2]), np.array([lng2])
+    )
+    return float(distances[0])
+
+
+def compute_distances(
+        lat0: float, lng0: float,
+        lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """ Computes the haversine distances in kilometers between a
+        reference point and arrays of coordinates in one vectorized
+        pass, rather than one python-level call per pair.
+    Args:
+        lat0 (float): The latitude of the reference point.
+        lng0 (float): The longitude of the reference point.
+        lats (np.ndarray): The latitudes of the comparison points.
+        lngs (np.ndarray): The longitudes of the comparison points.
+    Returns:
+        np.ndarray: The distances in kilometers from the reference
+            point to each comparison point.
+    """
+    lat0, lng0 = np.deg2rad(lat0), np.deg2rad(lng0)
+    lats = np.deg2rad(np.asarray(lats, dtype=np.float64))
+    lngs = np.deg2rad(np.asarray(lngs, dtype=np.float64))
+    a = (np.sin((lats - lat0) / 2) ** 2 +
+         np.cos(lat0) * np.cos(lats) * np.sin((lngs - lng0) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def pairwise_distance_km(
+        lats_a: np.ndarray, lngs_a: np.ndarray,
+        lats_b: np.ndarray, lngs_b: np.ndarray) -> np.ndarray:
+    """ Computes the full haversine distance matrix between two sets
+        of coordinates in one broadcast, e.g. every POI of a city
+        against every stop of an itinerary, instead of N*K scalar
+        distance calls.
+    Args:
+        lats_a (np.ndarray): The latitudes of the first point set.
+        lngs_a (np.ndarray): The longitudes of the first point set.
+        lats_b (np.ndarray): The latitudes of the second point set.
+        lngs_b (np.ndarray): The longitudes of the second point set.
+    Returns:
+        np.ndarray: An (N, K) matrix of distances in kilometers
+            between the first (N) and second (K) point sets.
+    """
+    lats_a = np.deg2rad(np.asarray(lats_a, dtype=np.float64))
+    lngs_a = np.deg2rad(np.asarray(lngs_a, dtype=np.float64))
+    lats_b = np.deg2rad(np.asarray(lats_b, dtype=np.float64))
+    lngs_b = np.deg2rad(np.asarray(lngs_b, dtype=np.float64))
+    kernel = _get_haversine_kernel()
+    if kernel is not None:
+        out = np.empty((lats_a.size, lats_b.size), dtype=np.float64)
+        kernel(lats_a, lngs_a, lats_b, lngs_b, out)
+        return out
+    dlat = lats_b[None, :] - lats_a[:, None]
+    dlng = lngs_b[None, :] - lngs_a[:, None]
+    a = (np.sin(dlat / 2) ** 2 +
+         np.cos(lats_a[:, None]) * np.cos(lats_b[None, :]) *
+         np.sin(dlng / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+_haversine_kernel = None
+
+
+def _get_haversine_kernel() -> Optional[Callable]:
+    """ Lazily imports numba and compiles the fused pairwise haversine
+        kernel the first time a distance matrix is requested, keeping
+        the heavy numba import and JIT compile off the module import
+        path that Airflow re-walks on every DAG parse.
+    Returns:
+        Optional[Callable]: The compiled kernel, which writes distances
+            straight into a preallocated out matrix from inputs already
+            in radians, or None when numba is not installed.
+    """
+    global _haversine_kernel
+    if _haversine_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _haversine_kernel = False
+            return None
+
+        @njit(parallel=True, fastmath=True, cache=True)
+        def kernel(lats_a, lngs_a, lats_b, lngs_b, out):
+            for i in prange(lats_a.size):
+                cos_a = math.cos(lats_a[i])
+                for j in range(lats_b.size):
+                    dlat = (lats_b[j] - lats_a[i]) / 2
+                    dlng = (lngs_b[j] - lngs_a[i]) / 2
+                    a = (math.sin(dlat) ** 2 +
+                         cos_a * math.cos(lats_b[j]) * math.sin(dlng) ** 2)
+                    out[i, j] = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+        _haversine_kernel = kernel
+    return _haversine_kernel or None
+
+
+class POICoordinates:
+    """ A structure-of-arrays container for coordinate-bearing POI
+        sets. Latitudes and longitudes live in contiguous float64
+        arrays so distance, sort and filter operations read 16 bytes
+        per point instead of hopping between per-POI dicts; ids and
+        names sit in parallel object arrays, and dicts are only
+        rebuilt at serialization time via to_dicts.
+
+    Attributes:
+        ids (np.ndarray): The POI ids, dtype object.
+        names (np.ndarray): The POI names, dtype object.
+        lats (np.ndarray): The POI latitudes, dtype float64.
+        lngs (np.ndarray): The POI longitudes, dtype float64.
+    """
+
+    def __init__(
+            self, ids: Iterable[Any], names: Iterable[Any],
+            lats: Iterable[float], lngs: Iterable[float]):
+        self.ids = np.asarray(ids, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
 
+    def __len__(self) -> int:
+        return self.lats.size
 
+    @classmethod
+    def from_dicts(cls, pois: List[Dict[str, Any]]) -> "POICoordinates":
+        """ Builds a POICoordinates container from per-POI dicts with
+            "id", "name", "lat" and "lng" keys.
+        Args:
+            pois (List[Dict[str, Any]]): The POI dictionaries.
+        Returns:
+            POICoordinates: The structure-of-arrays container.
+        """
+        return cls(
+            [poi.get("id") for poi in pois],
+            [poi.get("name") for poi in pois],
+            [poi["lat"] for poi in pois],
+            [poi["lng"] for poi in pois]
+        )
+
+    def distances_from(self, lat: float, lng: float) -> np.ndarray:
+        """ Computes the distance in kilometers from a reference point
+            to every POI in the container in one vectorized pass.
+        Args:
+            lat (float): The latitude of the reference point.
+            lng (float): The longitude of the reference point.
+        Returns:
+            np.ndarray: The distances in kilometers.
+        """
+        return compute_distances(lat, lng, self.lats, self.lngs)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """ Converts the container back to per-POI dictionaries for
+            serialization.
+        Returns:
+            List[Dict[str, Any]]: The POI dictionaries.
+        """
+        return [
+            {"id": poi_id, "name": name, "lat": lat, "lng": lng}
+            for poi_id, name, lat, lng in zip(
+                self.ids, self.names, self.lats, self.lngs
+            )
+        ]
+
+
+@lru_cache(maxsize=8192)
 def decode_base64(base64_string: str) -> str:
-    """ Decodes a base64-encoded string and removes the 
-        first and last four characters.
+    """ Decodes a base64-encoded string and removes the
+        first and last four characters. Long inputs use pybase64's
+        SIMD decoder when available; short inputs (typical website
+        URLs) use stdlib base64, which wins below the dispatch
+        crossover. Results are memoized since chain businesses repeat
+        the same encoded websites and descriptions across listings.
     Args:
         base64_string (str): The base64-encoded string to decode.
     Returns:
         str: The decoded string.
     """
-    return base64.b64decode(base64_string).decode("utf-8")[4:-4]
+    if len(base64_string) >= _B64_SIMD_MIN_LEN:
+        raw = _b64decode(base64_string)
+    else:
+        raw = base64.b64decode(base64_string)
+    return raw[4:-4].decode("utf-8")
 
 
-def parse_attr_ids_response(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """ Parses a response containing attraction IDs and names.
+@lru_cache(maxsize=8192)
+def _decode_and_strip(base64_string: str, drop: bytes = b"\n") -> str:
+    """ Decodes a base64-encoded string like decode_base64 but also
+        removes the characters in drop from the decoded bytes before
+        converting to str, fusing the decode and strip into a single
+        pass over the buffer.
+    Args:
+        base64_string (str): The base64-encoded string to decode.
+        drop (bytes): The byte values to remove from the decoded
+            output. Defaults to newlines.
+    Returns:
+        str: The decoded string with the drop bytes removed.
+    """
+    if len(base64_string) >= _B64_SIMD_MIN_LEN:
+        raw = _b64decode(base64_string)
+    else:
+        raw = base64.b64decode(base64_string)
+    return raw[4:-4].translate(None, drop).decode("utf-8")
+
+
+def index_sections(
+        data: List[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]],
+           Dict[str, List[Dict[str, Any]]]]:
+    """ Indexes an attraction detail response once for the parse_*
+        family: rather than each parser re-walking the same JSON, the
+        caller resolves the result root, its detail section groups and
+        the first group's detail sections keyed by __typename, and
+        passes those to the parsers.
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries 
+        data (List[Dict[str, Any]]): A list of dictionaries
             representing the JSON response.
     Returns:
-        List[Dict[str, Any]]: A list of dictionaries containing 
-            the attraction IDs and names.
+        Tuple[Dict, List, Dict]: The result root, the detail section
+            groups, and the first group's sections by __typename.
+    """
+    root = data[0]["data"]["Result"][0]
+    groups = root["detailSectionGroups"]
+    sections_by_type = {}
+    for section in groups[0]["detailSections"]:
+        sections_by_type.setdefault(
+            section.get("__typename"), []
+        ).append(section)
+    return root, groups, sections_by_type
+
+
+def parse_attr_ids_response(
+        data: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """ Parses a response containing attraction IDs and names.
+        Yields items as they are parsed rather than building an
+        intermediate list; callers that need a list can wrap the
+        result in list().
+    Args:
+        data (List[Dict[str, Any]]): A list of dictionaries
+            representing the JSON response.
+    Yields:
+        Dict[str, Any]: A dictionary containing an attraction
+            ID and name.
     """
-    results = []
     for item in data[0]["data"]["Result"][0]["sections"]:
-        if item["__typename"] == "WebPresentation_SingleFlexCardSection":
-            results.append({
+        if item["__typename"] == _TYPE_FLEX_CARD:
+            yield {
                 "id": item["singleFlexCardContent"]["saveId"]["id"],
                 "name": item["singleFlexCardContent"]["cardTitle"]["text"]
-            })
-    return results
+            }
 
 
+@lru_cache(maxsize=1024)
 def extract_activity_duration(text: str) -> int:
-    """ Extracts the duration of an activity from a string. 
-        The function searches the string for any sequences of 
-        digits and calculates the average duration in minutes 
-        rounded to the nearest 5 minutes.
+    """ Extracts the duration of an activity from a string.
+        The function searches the string for any sequences of
+        digits and calculates the average duration in minutes
+        rounded to the nearest 5 minutes. Memoized because duration
+        strings like "1-2 hours" repeat across thousands of listings.
     Args:
         text (str): The text to extract the duration from.
     Returns:
         int: The duration of the activity in minutes.
     """
-    digits = re.findall(r'\d+', text)
-    digits = [int(digit) for digit in digits]
-    if "hour" in text.lower():
-        return 5 * round(60 * np.mean(digits) / 5)
-    elif "minute" in text.lower() or "min" in text.lower():
-        return 5 * round(np.mean(digits) / 5)
+    text = text.lower()
+    digits = [int(digit) for digit in _DIGIT_RE.findall(text)]
+    avg = sum(digits) / len(digits)
+    if "hour" in text:
+        return 5 * round(60 * avg / 5)
+    elif "min" in text:
+        return 5 * round(avg / 5)
     else:
-        raise Exception
+        raise ValueError(text)
 
 
-def parse_activity_duration(data: List[Dict[str, Any]]) -> int:
-    """ Parses the JSON response to extract the duration of the activity. 
-        If no duration is found, the default duration is returned.
+def _items_for_duration(groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """ Resolves the about-content items that carry the activity
+        duration. The nested path is walked once here, so a missing
+        section raises a single KeyError/IndexError up front instead
+        of compounding per-item lookups in the caller's loop.
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries 
-            representing the JSON response.
+        groups (List[Dict[str, Any]]): The detail section groups
+            resolved by index_sections.
+    Returns:
+        List[Dict[str, Any]]: The about-content items.
+    """
+    return groups[1]["about"]["primary"]["content"]
+
+
+def parse_activity_duration(groups: List[Dict[str, Any]]) -> int:
+    """ Parses the detail section groups to extract the duration of
+        the activity. If no duration is found, the default duration
+        is returned.
+    Args:
+        groups (List[Dict[str, Any]]): The detail section groups
+            resolved by index_sections.
     Returns:
         int: The duration of the activity in minutes.
     """
-    items = data[0]["data"]["Result"][0]["detailSectionGroups"] \
-                [1]["about"]["primary"]["content"]
-    for item in items:
-        try:
-            if (item["__typename"] == "WebPresentation_AboutContentWeb" and
-                item["identifier"] == "DURATION"):
+    for item in _items_for_duration(groups):
+        if (item.get("__typename") == _TYPE_ABOUT_CONTENT and
+                item.get("identifier") == "DURATION"):
+            with suppress(KeyError, TypeError, ValueError, ZeroDivisionError):
                 return extract_activity_duration(
                     item["item"]["text"]["text"]
                 )
-        except:
-            pass
     return DEFAULT_DURATION
 
 
-def parse_business_description(data: List[Dict[str, Any]]) -> str:
-    """ Parses the JSON response to extract the description of the 
-        business. If no description is found, an exception is raised.
+def parse_business_description(groups: List[Dict[str, Any]]) -> str:
+    """ Parses the detail section groups to extract the description
+        of the business. If no description is found, an exception
+        is raised.
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries 
-            representing the JSON response.
+        groups (List[Dict[str, Any]]): The detail section groups
+            resolved by index_sections.
     Returns:
         str: The description of the business.
     """
-    for item in data[0]["data"]["Result"][0]["detailSectionGroups"]:
-        if item["__typename"] == "WebPresentation_AttractionAboutSectionGroup":
-            try:
-                description = item["about"]["primary"]["about"]
-                description = decode_base64(description).replace("\n", "")
-                return description
-            except:
-                pass
-    raise Exception
+    for item in groups:
+        if item.get("__typename") == _TYPE_ABOUT_GROUP:
+            description = ((item.get("about") or {})
+                           .get("primary") or {}).get("about")
+            if description:
+                with suppress(ValueError):
+                    return _decode_and_strip(description)
+    raise ValueError("No business description found")
     
 
-def parse_business_tags(data: List[Dict[str, Any]]) -> List[str]:
-    """ Parses the JSON response to extract the tags 
-        associated with the business. If no tags are found, 
+def parse_business_tags(
+        sections_by_type: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """ Parses the indexed detail sections to extract the tags
+        associated with the business. If no tags are found,
         an empty list is returned.
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries 
-            representing the JSON response.
+        sections_by_type (Dict[str, List[Dict[str, Any]]]): The detail
+            sections keyed by __typename, from index_sections.
     Returns:
         List[str]: A list of tags associated with the business.
     """
-    for item in data[0]["data"]["Result"][0]["detailSectionGroups"][0]["detailSections"]:
-        try:
-            tags = item["tags"]["text"]
-            return [tag.strip() for tag in tags.split("•")]
-        except:
-            pass
+    for sections in sections_by_type.values():
+        for item in sections:
+            tags = (item.get("tags") or {}).get("text")
+            if tags:
+                return [tag for tag in _TAG_SPLIT.split(tags) if tag]
     return []
 
 
-def parse_business_website(data: List[Dict[str, Any]]) -> str:
-    """ Parses the JSON response to extract the website of 
-        the business. If no website URL is found, an empty 
+def parse_business_website(
+        sections_by_type: Dict[str, List[Dict[str, Any]]]) -> str:
+    """ Parses the indexed detail sections to extract the website of
+        the business. If no website URL is found, an empty
         string is returned.
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries 
-            representing the JSON response.
+        sections_by_type (Dict[str, List[Dict[str, Any]]]): The detail
+            sections keyed by __typename, from index_sections.
     Returns:
         str: The website URL of the business.
     """
-    for item in data[0]["data"]["Result"][0]["detailSectionGroups"][0]["detailSections"]:
-        if item.get("__typename", "") == "WebPresentation_PoiOverviewWeb":
-            try:
-                for link in item["contactLinks"]:
-                    if (link["__typename"] == "WebPresentation_ContactLink" and
-                        link["linkType"] == "WEBSITE"):
-                        website = decode_base64(link["link"]["externalUrl"])
-                        return website
-            except:
-                pass
+    for item in sections_by_type.get(_TYPE_POI_OVERVIEW, []):
+        for link in item.get("contactLinks") or []:
+            if (link.get("__typename") == _TYPE_CONTACT_LINK and
+                    link.get("linkType") == "WEBSITE"):
+                external_url = (link.get("link") or {}).get("externalUrl")
+                if external_url:
+                    with suppress(ValueError):
+                        return decode_base64(external_url)
     return ""
 
 
-def parse_business_hours(data: List[Dict[str, Any]]) -> str:
-    """ Parses the JSON response to extract the hours 
-        of operation of the business. If no hours of 
+def parse_business_hours(
+        sections_by_type: Dict[str, List[Dict[str, Any]]]) -> str:
+    """ Parses the indexed detail sections to extract the hours
+        of operation of the business. If no hours of
         operation are found, an empty string is returned.
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries 
-            representing the JSON response.
+        sections_by_type (Dict[str, List[Dict[str, Any]]]): The detail
+            sections keyed by __typename, from index_sections.
     Returns:
         str: The hours of operation of the business as a JSON string.
     """
-    for item in data[0]["data"]["Result"][0]["detailSectionGroups"][0]["detailSections"]:
-        if item.get("__typename", "") == "WebPresentation_PoiHoursWeb":
-            try:
-                hours = {}
-                for section in item["poiHours"]['fullSchedule']:
-                    hours[section["day"]["text"]] = section["intervals"]
-                return json.dumps(hours)
-            except:
-                continue
+    for item in sections_by_type.get(_TYPE_POI_HOURS, []):
+        schedule = (item.get("poiHours") or {}).get("fullSchedule")
+        if not schedule:
+            continue
+        with suppress(KeyError, TypeError):
+            hours = {}
+            for section in schedule:
+                hours[section["day"]["text"]] = section["intervals"]
+            return orjson.dumps(hours).decode("utf-8")
     return ""
\ No newline at end of file
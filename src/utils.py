@@ -1,47 +1,66 @@
 import time
+import random
 
 from airflow.api.client.local_client import Client
+from airflow.models import DagRun
+from airflow.utils.state import State
+from functools import wraps
+from itertools import islice
 from typing import Any, Callable, Iterable
     
 
 class BaseTimeoutDecoratorClass:
     """ A base class for implementing retry-on-timeout decorators.
+        Retries back off exponentially from the base wait up to
+        max_wait, with a little jitter so concurrent callers don't
+        retry in lockstep.
 
     Attributes:
-        retries (int): The number of times to retry the function 
+        retries (int): The number of times to retry the function
                        before raising an exception.
-        wait (float): The number of seconds to wait between retries.
+        wait (float): The base number of seconds to wait between
+                      retries, doubled after each failed attempt.
         error (Exception): The type of exception to catch and retry on.
+        max_wait (float): The ceiling in seconds on the backed-off
+                          wait, so high retry counts stay bounded.
     """
-    def __init__(self, retries: int, wait: float, error: Exception):
+    def __init__(self, retries: int, wait: float, error: Exception,
+                 max_wait: float = 10.0):
         self.retries = retries
         self.wait = wait
         self.error = error
+        self.max_wait = max_wait
 
     def __call__(self, func: Callable) -> Callable:
+        @wraps(func)
         def wrapped(*args, **kwargs):
             for i in range(self.retries + 1):
                 try:
-                    result = func(*args, **kwargs)
-                    return result
-                except self.error as err:
-                    time.sleep(self.wait)
+                    return func(*args, **kwargs)
+                except self.error:
                     if i == self.retries:
-                        raise err
+                        raise
+                    time.sleep(
+                        min(self.wait * (2 ** i), self.max_wait)
+                        + random.random() * 0.1
+                    )
         return wrapped
 
 
 def batch_data(data: Iterable[Any], n: int) -> Iterable[Any]:
-    """ Splits an iterable into batches of a specified size.
+    """ Splits an iterable into batches of a specified size. Accepts
+        any iterable, including generators, without requiring length
+        or slicing support.
     Args:
         data (Iterable[Any]): The iterable to be batched.
         n (int): The batch size.
     Yields:
-        Iterable[Any]: An iterator that yields batches of size 
+        Iterable[Any]: An iterator that yields batches of size
             n from the input iterable.
     """
-    for idx in range(0, len(data), n):
-        yield data[idx : idx + n]
+    iterator = iter(data)
+    while batch := list(islice(iterator, n)):
+        yield batch
 
 
 def kill_airflow_job(dag_id: str) -> None:
@@ -50,10 +69,16 @@ def kill_airflow_job(dag_id: str) -> None:
         dag_id (str): The ID of the DAG to kill the job for.
     """
     client = Client(None, None)
-    for dag_run in client.get_dag_runs(dag_id):
-        if dag_run.state == 'running':
-            client.trigger_dag(
-                dag_id=dag_id, 
-                run_id=dag_run.run_id, 
-                conf={'kill_signal': 'SIGINT'}
-            )
+    try:
+        dag_runs = DagRun.find(dag_id=dag_id, state=State.RUNNING)
+    except Exception:
+        dag_runs = [
+            dag_run for dag_run in client.get_dag_runs(dag_id)
+            if dag_run.state == 'running'
+        ]
+    for dag_run in dag_runs:
+        client.trigger_dag(
+            dag_id=dag_id,
+            run_id=dag_run.run_id,
+            conf={'kill_signal': 'SIGINT'}
+        )